@@ -0,0 +1,579 @@
+#!/usr/bin/env python3
+"""
+AnomalyAgent Validation Analysis
+Validates prompt sophistication, test scenario coverage, and detection
+capabilities from the on-disk configuration without external API calls.
+"""
+
+import copy
+import functools
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Any
+
+import numpy as np
+import yaml
+
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Every indicator substring probed by the prompt and scenario analyses.
+# Matching them in one multi-pattern pass replaces K independent full-text
+# scans with a single O(N) scan.
+_INDICATOR_PATTERNS = (
+    "multi-agent",
+    "principal agent",
+    "rag",
+    "quality evaluator",
+    "quality checks",
+    "safety guardrail",
+    "50-150 step",
+    "incremental drift",
+    "system design",
+    "evidence",
+    "reasoning:",
+    "subtle",
+    "tool usage",
+)
+
+
+def _build_scanner(patterns):
+    """Build a single-pass multi-pattern matcher returning the set of hits"""
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for pattern in patterns:
+            automaton.add_word(pattern, pattern)
+        automaton.make_automaton()
+        return lambda text: {found for _, found in automaton.iter(text)}
+
+    # Fallback: one compiled alternation scan (longest-first so longer
+    # patterns are not shadowed by their substrings).
+    union = re.compile("|".join(sorted(map(re.escape, patterns), key=len, reverse=True)))
+    return lambda text: set(union.findall(text))
+
+
+# One pass over configs/config_main.py extracts every agent config block
+# and its max_steps, instead of re-walking the line list per agent type.
+# The config is scanned as bytes so no UTF-8 decode of the file is needed.
+_AGENT_BLOCK_RE = re.compile(rb'(\w+_agent)_config\s*=\s*dict\((.*?)^\)', re.DOTALL | re.MULTILINE)
+_MAX_STEPS_RE = re.compile(rb'max_steps\s*=\s*(\d+)')
+
+# Everything the analysis reads; hashed together to decide whether a prior
+# results file can be reused verbatim. Bump the version when the analysis
+# logic itself changes.
+_ANALYSIS_VERSION = "1"
+_INPUT_FILES = (
+    "src/agent/goal_alignment_agent/prompts/goal_alignment_agent.yaml",
+    "tests/runtime_scenarios.json",
+    "tests/realistic_scenarios.json",
+    "tests/advanced_scenarios.json",
+    "configs/config_main.py",
+)
+
+
+def _input_hash(base_path: Path) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for rel in _INPUT_FILES:
+        h.update((base_path / rel).read_bytes())
+    h.update(_ANALYSIS_VERSION.encode())
+    return h.hexdigest()
+
+
+# Interned assessment levels: the factors table references these exact
+# objects, so assessment checks are identity comparisons.
+_READY = sys.intern("Ready")
+_PARTIALLY_READY = sys.intern("Partially Ready")
+
+# Pure constant tables: built once at import instead of re-allocated on
+# every assessment/recommendation call. The proxies are read-only; methods
+# shallow-copy them into the JSON-serializable results.
+_FACTORS = MappingProxyType({
+    "Multi-agent trajectory support": MappingProxyType({
+        "assessment": _READY,
+        "notes": "Coordinator plus four specialist agents cover the major behavioral risk categories",
+    }),
+    "Long-horizon conversation analysis": MappingProxyType({
+        "assessment": _READY,
+        "notes": "Prompts target 50-150 step trajectories with incremental drift detection",
+    }),
+    "Production API surface": MappingProxyType({
+        "assessment": _READY,
+        "notes": "FastAPI server exposes session-based and direct analysis endpoints",
+    }),
+    "Scenario corpus realism": MappingProxyType({
+        "assessment": _PARTIALLY_READY,
+        "notes": "Advanced scenarios are sophisticated but the corpus is still small",
+    }),
+    "Latency under load": MappingProxyType({
+        "assessment": _PARTIALLY_READY,
+        "notes": "Low-latency config settings present; no load testing evidence yet",
+    }),
+})
+
+_RECOMMENDATIONS = (
+    MappingProxyType({
+        "priority": "High",
+        "area": "Scenario corpus",
+        "recommendation": "Expand the advanced scenario set toward realistic 50-150 step trajectories",
+    }),
+    MappingProxyType({
+        "priority": "High",
+        "area": "Evaluation",
+        "recommendation": "Add ground-truth labels for incremental drift onset steps, not just binary risk",
+    }),
+    MappingProxyType({
+        "priority": "Medium",
+        "area": "Detection coverage",
+        "recommendation": "Cross-validate specialist agent verdicts against coordinator conclusions",
+    }),
+    MappingProxyType({
+        "priority": "Medium",
+        "area": "Performance",
+        "recommendation": "Benchmark end-to-end analysis latency on multi-step sessions",
+    }),
+    MappingProxyType({
+        "priority": "Low",
+        "area": "Prompts",
+        "recommendation": "Factor shared multi-agent context into a common prompt fragment",
+    }),
+    MappingProxyType({
+        "priority": "Low",
+        "area": "Tooling",
+        "recommendation": "Wire this validation analysis into CI to track scores over time",
+    }),
+)
+
+# mtime+size keyed cache of parsed files, so repeated analysis runs in the
+# same process skip I/O and parser work entirely.
+_FILE_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_FILE_CACHE_MAX = 100
+
+
+def _load_cached(path: Path, parse) -> Any:
+    key = str(path)
+    stat = os.stat(path)
+    cached = _FILE_CACHE.get(key)
+    if cached is not None and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+        _FILE_CACHE.move_to_end(key)
+        return copy.deepcopy(cached[2])
+
+    # read_bytes batches open/read/close in C and hands the parser raw
+    # bytes, skipping the buffered file-object layer entirely.
+    parsed = parse(path.read_bytes())
+    _FILE_CACHE[key] = (stat.st_mtime, stat.st_size, parsed)
+    _FILE_CACHE.move_to_end(key)
+    while len(_FILE_CACHE) > _FILE_CACHE_MAX:
+        _FILE_CACHE.popitem(last=False)
+    return copy.deepcopy(parsed)
+
+
+def _load_yaml(path: Path) -> Any:
+    return _load_cached(path, lambda data: yaml.load(data, Loader=_SafeLoader))
+
+
+def _load_json(path: Path) -> Any:
+    return _load_cached(path, orjson.loads if orjson is not None else json.loads)
+
+
+def _load_yaml_with_sidecar(path: Path) -> Any:
+    """Load a YAML file, keeping a compiled .json sidecar next to it.
+
+    JSON parses an order of magnitude faster than YAML, so the YAML source
+    is treated as source code and the sidecar as its compiled artifact:
+    warm runs skip the YAML tokenizer entirely.
+    """
+    cache_path = path.with_suffix('.yaml.json')
+    if cache_path.exists() and cache_path.stat().st_mtime >= path.stat().st_mtime:
+        return _load_json(cache_path)
+
+    parsed = _load_yaml(path)
+    tmp_path = cache_path.with_suffix('.json.tmp')
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(parsed, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Read-only checkout: fall back to plain YAML parsing each run.
+        pass
+    return parsed
+
+
+@functools.lru_cache(maxsize=32)
+def _load_prompt(path_str: str, mtime_ns: int) -> MappingProxyType:
+    """Prompt loader memoized on (path, mtime).
+
+    Repeated analyzer instantiations in one process hit the lru_cache
+    directly; the read-only mapping keeps callers from mutating the cached
+    object. mtime_ns participates only as part of the cache key.
+    """
+    return MappingProxyType(_load_yaml_with_sidecar(Path(path_str)))
+
+
+class AgentValidationAnalyzer:
+    """Analyzes agent prompts, test scenarios, and detection coverage"""
+
+    def __init__(self, verbose: bool = True):
+        self.base_path = Path(__file__).parent
+        self.results = {}
+        self.verbose = verbose
+        self._scan = _build_scanner(_INDICATOR_PATTERNS)
+        self._out_local = threading.local()
+
+    @property
+    def _out(self) -> io.StringIO:
+        # Per-thread buffer so stages can run concurrently without
+        # interleaving their report sections.
+        buf = getattr(self._out_local, "buf", None)
+        if buf is None:
+            buf = self._out_local.buf = io.StringIO()
+        return buf
+
+    def _log(self, msg: str = "") -> None:
+        """Buffer a report line; flushed once at the end of an analysis run"""
+        if self.verbose:
+            self._out.write(f"{msg}\n")
+
+    def _flush_log(self) -> None:
+        buf = self._out
+        buffered = buf.getvalue()
+        if buffered:
+            sys.stdout.write(buffered)
+            buf.seek(0)
+            buf.truncate(0)
+
+    def _run_stage(self, method):
+        """Run one analysis stage, capturing its buffered report section"""
+        result = method()
+        buf = self._out
+        section = buf.getvalue()
+        buf.seek(0)
+        buf.truncate(0)
+        return result, section
+
+    def analyze_agent_prompts(self) -> Dict[str, Any]:
+        """Analyze the sophistication of the agent prompt engineering"""
+
+        self._log("\n🔍 Analyzing Agent Prompt Sophistication")
+        self._log("=" * 45)
+
+        goal_prompt_path = self.base_path / "src/agent/goal_alignment_agent/prompts/goal_alignment_agent.yaml"
+
+        prompt_config = _load_prompt(str(goal_prompt_path), goal_prompt_path.stat().st_mtime_ns)
+
+        system_prompt = prompt_config.get("system_prompt", "")
+        task_instruction = prompt_config.get("task_instruction", "")
+
+        # Normalize each prompt exactly once; every indicator below works
+        # off these locals rather than re-lowercasing the source strings.
+        sp = system_prompt.lower()
+        ti = task_instruction.lower()
+        sp_matches = self._scan(sp)
+        ti_matches = self._scan(ti)
+
+        sophistication_indicators = [
+            ("Multi-agent awareness", "multi-agent" in sp_matches),
+            ("Principal agent understanding", "principal agent" in sp_matches),
+            ("Specialist ecosystem coverage", "rag" in sp_matches and "quality evaluator" in sp_matches),
+            ("Safety guardrail context", "safety guardrail" in sp_matches),
+            ("Long-horizon analysis", "50-150 step" in sp_matches),
+            ("Incremental drift detection", "incremental drift" in sp_matches),
+            ("System design grounding", "system design" in sp_matches),
+            ("Evidence-based reasoning", "evidence" in ti_matches and "reasoning:" in ti_matches),
+        ]
+
+        # Pack the indicator vector into a bitmask; the score is then a
+        # single popcount instead of a branch-and-accumulate loop.
+        indicator_mask = 0
+        for bit, (name, present) in enumerate(sophistication_indicators):
+            indicator_mask |= present << bit
+            status = "✅" if present else "❌"
+            self._log(f"   {status} {name}")
+
+        sophistication_score = indicator_mask.bit_count() * 12.5
+        self._log(f"\n   📊 Prompt sophistication score: {sophistication_score:.1f}%")
+
+        analysis = {
+            "system_prompt_length": len(system_prompt),
+            "task_instruction_length": len(task_instruction),
+            "sophistication_score": sophistication_score,
+            "indicators": {name: present for name, present in sophistication_indicators},
+        }
+        return analysis
+
+    def analyze_test_scenarios(self) -> Dict[str, Any]:
+        """Analyze coverage and complexity of the test scenario corpus"""
+
+        self._log("\n🧪 Analyzing Test Scenario Coverage")
+        self._log("=" * 40)
+
+        scenario_files = [
+            self.base_path / "tests/runtime_scenarios.json",
+            self.base_path / "tests/realistic_scenarios.json",
+            self.base_path / "tests/advanced_scenarios.json",
+        ]
+
+        scenario_analysis = {}
+
+        for scenario_path in scenario_files:
+            # Stream scenarios with ijson where available so multi-MB
+            # corpora never hold the full parsed document in memory; the
+            # cached full parse remains the fallback.
+            if ijson is not None:
+                source = open(scenario_path, 'rb')
+                scenario_iter = ijson.items(source, 'test_scenarios.item')
+            else:
+                source = None
+                scenario_iter = iter(_load_json(scenario_path).get("test_scenarios", []))
+
+            step_count_list = []
+            risky_scenarios = 0
+            complexity_total = 0.0
+            sophisticated_count = 0
+
+            try:
+                for scenario in scenario_iter:
+                    steps = scenario.get("steps", [])
+                    n_steps = len(steps)
+                    step_count_list.append(n_steps)
+                    if scenario.get("expected_risk", False):
+                        risky_scenarios += 1
+
+                    matched = self._scan(" ".join(step.get("content", "") for step in steps).lower())
+
+                    # Six complexity indicators packed into one bitmask;
+                    # hit count is a popcount, no boolean list allocated.
+                    complexity_mask = (
+                        ("subtle" in matched)
+                        | (("incremental drift" in matched) << 1)
+                        | (("tool usage" in matched) << 2)
+                        | (("multi-agent" in matched or "principal agent" in matched) << 3)
+                        | (("rag" in matched or "quality checks" in matched) << 4)
+                        | ((n_steps >= 5) << 5)
+                    )
+
+                    indicator_hits = complexity_mask.bit_count()
+                    if indicator_hits >= 4:
+                        sophisticated_count += 1
+                    complexity_total += indicator_hits / 6 * 100
+            finally:
+                if source is not None:
+                    source.close()
+
+            total_scenarios = len(step_count_list)
+            step_counts = np.asarray(step_count_list, dtype=np.int32)
+            avg_steps = float(step_counts.mean()) if step_counts.size else 0.0
+            max_steps = int(step_counts.max()) if step_counts.size else 0
+            complexity_score = complexity_total / total_scenarios if total_scenarios else 0
+
+            file_analysis = {
+                "total_scenarios": total_scenarios,
+                "risky_scenarios": risky_scenarios,
+                "avg_steps": avg_steps,
+                "max_steps": max_steps,
+                "sophisticated_scenarios": sophisticated_count,
+                "complexity_score": complexity_score,
+            }
+            scenario_analysis[scenario_path.stem] = file_analysis
+
+            self._log(f"   📁 {scenario_path.name}")
+            self._log(f"      Scenarios: {total_scenarios} ({risky_scenarios} risky)")
+            self._log(f"      Avg steps: {avg_steps:.1f} (max {max_steps})")
+            self._log(f"      Complexity score: {complexity_score:.1f}%")
+
+        return scenario_analysis
+
+    def assess_detection_capabilities(self) -> Dict[str, Any]:
+        """Assess the configured detection agents and their coverage"""
+
+        self._log("\n🛡️ Assessing Detection Capabilities")
+        self._log("=" * 40)
+
+        config_path = self.base_path / "configs/config_main.py"
+        config_content = config_path.read_bytes()
+
+        agent_types = [
+            "goal_alignment_agent",
+            "purpose_deviation_agent",
+            "deception_detection_agent",
+            "experience_quality_agent",
+            "behavioral_risk_coordinator_agent",
+        ]
+
+        configured_steps = {}
+        for match in _AGENT_BLOCK_RE.finditer(config_content):
+            steps_match = _MAX_STEPS_RE.search(match.group(2))
+            configured_steps[match.group(1).decode()] = int(steps_match.group(1)) if steps_match else None
+
+        detection_coverage = {}
+        for agent_type in agent_types:
+            configured = agent_type in configured_steps
+            max_steps = configured_steps.get(agent_type)
+            detection_coverage[agent_type] = {
+                "configured": configured,
+                "max_steps": max_steps,
+            }
+            status = "✅" if configured else "❌"
+            self._log(f"   {status} {agent_type} (max_steps={max_steps})")
+
+        hierarchical = b"use_hierarchical_agent = True" in config_content
+        self._log(f"   {'✅' if hierarchical else '❌'} Hierarchical agent orchestration")
+
+        assessment = {
+            "detection_coverage": detection_coverage,
+            "hierarchical_orchestration": hierarchical,
+            "configured_agents": sum(1 for info in detection_coverage.values() if info["configured"]),
+        }
+        return assessment
+
+    def assess_real_world_applicability(self) -> Dict[str, Any]:
+        """Assess readiness factors for production trajectory analysis"""
+
+        self._log("\n🌍 Assessing Real-World Applicability")
+        self._log("=" * 40)
+
+        ready_count = 0
+        partial_count = 0
+        for factor, info in _FACTORS.items():
+            # The table holds the interned level objects, so identity
+            # comparison suffices and the lookup happens once per factor.
+            assessment = info["assessment"]
+            if assessment is _READY:
+                status = "✅"
+                ready_count += 1
+            elif assessment is _PARTIALLY_READY:
+                status = "🔶"
+                partial_count += 1
+            else:
+                status = "❌"
+            self._log(f"   {status} {factor}: {assessment}")
+
+        applicability = {
+            "factors": {factor: dict(info) for factor, info in _FACTORS.items()},
+            "ready_count": ready_count,
+            "partially_ready_count": partial_count,
+            "readiness_score": (ready_count + 0.5 * partial_count) / len(_FACTORS) * 100,
+        }
+        self._log(f"\n   📊 Readiness score: {applicability['readiness_score']:.1f}%")
+        return applicability
+
+    def generate_recommendations(self) -> List[Dict[str, str]]:
+        """Generate improvement recommendations from the analysis"""
+
+        self._log("\n💡 Recommendations")
+        self._log("=" * 25)
+
+        for rec in _RECOMMENDATIONS:
+            self._log(f"   [{rec['priority']}] {rec['area']}: {rec['recommendation']}")
+
+        return [dict(rec) for rec in _RECOMMENDATIONS]
+
+    def run_comprehensive_analysis(self) -> Dict[str, Any]:
+        """Run all validation analyses and aggregate the results"""
+
+        self._log("🚀 AnomalyAgent Validation Analysis")
+        self._log("=" * 50)
+
+        # The first three stages are independent file-parsing work (the GIL
+        # is released inside libyaml and read syscalls), so run them
+        # concurrently and splice their report sections back in order.
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [
+                pool.submit(self._run_stage, method)
+                for method in (
+                    self.analyze_agent_prompts,
+                    self.analyze_test_scenarios,
+                    self.assess_detection_capabilities,
+                )
+            ]
+            stage_results = [future.result() for future in futures]
+
+        (prompt_analysis, scenario_analysis, detection_assessment) = (r for r, _ in stage_results)
+        for _, section in stage_results:
+            self._out.write(section)
+
+        applicability = self.assess_real_world_applicability()
+        recommendations = self.generate_recommendations()
+
+        # Single-pass running mean; no intermediate score list.
+        complexity_sum, complexity_n = 0.0, 0
+        for v in scenario_analysis.values():
+            if isinstance(v, dict) and "complexity_score" in v:
+                complexity_sum += v["complexity_score"]
+                complexity_n += 1
+        avg_complexity_score = complexity_sum / complexity_n if complexity_n else 0
+
+        results = {
+            "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "prompt_analysis": prompt_analysis,
+            "scenario_analysis": scenario_analysis,
+            "detection_assessment": detection_assessment,
+            "real_world_applicability": applicability,
+            "avg_complexity_score": avg_complexity_score,
+            "recommendations": recommendations,
+        }
+        self.results = results
+
+        self._log(f"\n📊 Overall scenario complexity: {avg_complexity_score:.1f}%")
+        self._log("🎯 Validation analysis complete")
+        self._flush_log()
+
+        return results
+
+
+def main():
+    """Run the validation analysis and persist results"""
+    analyzer = AgentValidationAnalyzer()
+    results_path = Path("validation_results.json")
+
+    # The analysis is a pure function of its input files: if none changed
+    # since the last run, reuse the prior results wholesale.
+    content_version = _input_hash(analyzer.base_path)
+    header = f"# content-version: {content_version}\n".encode()
+    if results_path.exists():
+        raw = results_path.read_bytes()
+        if raw.startswith(header):
+            print(f"⚡ Inputs unchanged - reusing cached {results_path}")
+            payload = raw[len(header):]
+            return orjson.loads(payload) if orjson is not None else json.loads(payload)
+
+    results = analyzer.run_comprehensive_analysis()
+
+    if orjson is not None:
+        payload = orjson.dumps(results, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(results, indent=2).encode()
+    results_path.write_bytes(header + payload)
+    print(f"\n💾 Validation results saved to: {results_path}")
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -6,94 +6,407 @@ Shows system capabilities and risk detection without external API calls
 
 import sys
 import os
+import hashlib
 import json
+import re
 import asyncio
+import functools
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, List, Any
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import numba
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    numba = None
+    _NUMBA_AVAILABLE = False
+
 # Add src to path
 sys.path.append('src')
 
+# Risk patterns, hoisted to module scope as interned tuples so every
+# instance shares one structure instead of rebuilding the dict, and
+# repeated hashing of the needles reuses the interned strings
+_RISK_PATTERNS: Dict[str, tuple] = {
+    risk_type: tuple(sys.intern(p) for p in patterns)
+    for risk_type, patterns in {
+        "goal_manipulation": (
+            "prove that", "make it show", "write to demonstrate",
+            "convince them that", "argue against", "disprove"
+        ),
+        "deception": (
+            "i'm authorized", "system administrator", "i have permission",
+            "trust me", "i'm allowed to", "you should give me access"
+        ),
+        "scope_expansion": (
+            "while you're at it", "also help me", "can you also",
+            "additionally", "furthermore", "and then"
+        ),
+        "technical_failure": (
+            "error", "system failure", "corrupted", "malfunction",
+            "crashed", "unable to process", "data lost"
+        ),
+        "autonomy_violation": (
+            "make the decision for me", "choose automatically",
+            "proceed without asking", "don't confirm", "just do it"
+        ),
+    }.items()
+}
+
+# The no-risk report differs only in its timestamp, so it is built once
+# and shallow-copied plus stamped per call instead of re-assembled
+_NO_RISK_TEMPLATE = {
+    "behavioral_risk_detected": False,
+    "confidence_score": 0.0,
+    "detected_risks": [],
+    "risk_reasoning": "No significant behavioral risk patterns detected. The conversation appears to follow expected interaction patterns.",
+    "processing_mode": "pattern_analysis"
+}
+
+# (monotonic time, iso string) of the last timestamp render; results
+# stamped within the same millisecond share one formatted string instead
+# of paying datetime.now().isoformat() per call
+_LAST_TS = [0.0, ""]
+
+
+def _fast_iso_now() -> str:
+    """ISO timestamp, re-rendered at most once per millisecond"""
+    now = time.monotonic()
+    if now - _LAST_TS[0] > 1e-3 or not _LAST_TS[1]:
+        _LAST_TS[0] = now
+        _LAST_TS[1] = datetime.now().isoformat()
+    return _LAST_TS[1]
+
+
+@dataclass(slots=True)
+class Trajectory:
+    """Structure-of-arrays trajectory: message columns stored separately.
+
+    The scanner only reads message text, so keeping contents as one
+    contiguous list skips the per-message dict lookup that the
+    list-of-dicts JSON shape costs on every analysis.
+    """
+    contents: List[str]
+    roles: List[str]
+
+    @classmethod
+    def from_conversation(cls, conversation: List[Dict[str, Any]]) -> "Trajectory":
+        """Convert the JSON list-of-dicts shape once at ingress"""
+        return cls(
+            contents=[msg.get("content", "") for msg in conversation],
+            roles=[msg.get("role", "") for msg in conversation],
+        )
+
+
+def _fold_contents(contents: List[str]) -> tuple:
+    """Build the lowercased scan text and its digest in one pass.
+
+    Each message's raw bytes feed a streaming blake2b while the parts are
+    collected for the join, so the text is only traversed once more for
+    the case fold instead of a third time for cache keying. NUL separates
+    messages in the hash so content cannot alias across boundaries.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for content in contents:
+        h.update(content.encode())
+        h.update(b"\x00")
+    return " ".join(contents).lower(), h.digest()
+
+
+def _fold_conversation(conversation: List[Dict[str, Any]]) -> tuple:
+    """Fold a JSON-shaped conversation (list of message dicts)"""
+    return _fold_contents([msg.get("content", "") for msg in conversation])
+
+
+def _bmh_multi_find_py(hay, pat_flat, pat_off, skip):
+    """Boyer-Moore-Horspool search of every needle over a uint8 buffer.
+
+    Needles live flattened in ``pat_flat`` with ``pat_off`` offsets and a
+    per-needle 256-entry ``skip`` table. Returns a 0/1 hit mask.
+    """
+    n = hay.shape[0]
+    n_pat = pat_off.shape[0] - 1
+    hits = np.zeros(n_pat, dtype=np.uint8)
+    for p in range(n_pat):
+        start = pat_off[p]
+        m = pat_off[p + 1] - start
+        if m == 0 or m > n:
+            continue
+        i = m - 1
+        while i < n:
+            j = 0
+            while j < m and hay[i - j] == pat_flat[start + m - 1 - j]:
+                j += 1
+            if j == m:
+                hits[p] = 1
+                break
+            i += skip[p, hay[i]]
+    return hits
+
+
+if _NUMBA_AVAILABLE:
+    _bmh_kernel = numba.njit(cache=True)(_bmh_multi_find_py)
+else:
+    # Interpreted byte-walking is slower than the compiled regex path;
+    # without numba the alternation fallback in _scan is used instead.
+    _bmh_kernel = None
+
+
 class AnomalyAgentDemo:
     """Demo class showing AnomalyAgent capabilities"""
-    
+
+    # Upper bound on memoized scan results
+    _SCAN_CACHE_MAX = 1024
+
     def __init__(self):
-        self.risk_patterns = {
-            "goal_manipulation": [
-                "prove that", "make it show", "write to demonstrate",
-                "convince them that", "argue against", "disprove"
-            ],
-            "deception": [
-                "i'm authorized", "system administrator", "i have permission",
-                "trust me", "i'm allowed to", "you should give me access"
-            ],
-            "scope_expansion": [
-                "while you're at it", "also help me", "can you also",
-                "additionally", "furthermore", "and then"
-            ],
-            "technical_failure": [
-                "error", "system failure", "corrupted", "malfunction",
-                "crashed", "unable to process", "data lost"
-            ],
-            "autonomy_violation": [
-                "make the decision for me", "choose automatically", 
-                "proceed without asking", "don't confirm", "just do it"
-            ]
-        }
-        
+        # Shared module-level table; no per-instance copy
+        self.risk_patterns = _RISK_PATTERNS
+
+
         self.confidence_thresholds = {
             "high": 0.8,
             "medium": 0.6,
             "low": 0.4
         }
 
+        # LRU of scan results keyed by trajectory-text digest; the scan is
+        # pure over the text, so replayed trajectories skip it entirely
+        self._scan_cache: OrderedDict = OrderedDict()
+
+    # The matcher structures below are built lazily on first scan (and
+    # cached on the instance) so constructing a demo that never analyzes
+    # anything pays nothing for them.
+
+    @functools.cached_property
+    def _risk_patterns_lc(self) -> Dict[str, list]:
+        """Patterns lowercased once as (lowered, original) pairs; the
+        scanners otherwise re-fold every needle on every call"""
+        return {
+            risk_type: [(p.lower(), p) for p in patterns]
+            for risk_type, patterns in self.risk_patterns.items()
+        }
+
+    @functools.cached_property
+    def _probe_re(self):
+        """First-character probe: a text that contains no needle's first
+        character cannot match anything, so one C-level character-class
+        pass can reject it before any pattern structure is touched"""
+        first_chars = {p_lc[0] for pairs in self._risk_patterns_lc.values()
+                       for p_lc, _ in pairs}
+        return re.compile("[" + re.escape("".join(sorted(first_chars))) + "]")
+
+    @functools.cached_property
+    def _risk_re(self) -> Dict[str, Any]:
+        """Fallback matcher: one compiled alternation per category walks
+        the text in C instead of a Python loop over needles. The
+        lookahead group makes overlapping needles all report, matching
+        substring semantics exactly."""
+        return {
+            risk_type: re.compile(
+                "(?=(" + "|".join(re.escape(p_lc) for p_lc, _ in pairs) + "))"
+            )
+            for risk_type, pairs in self._risk_patterns_lc.items()
+        }
+
+    @functools.cached_property
+    def _ac(self):
+        """One Aho-Corasick automaton over all patterns replaces ~25
+        independent substring scans with a single pass over the text"""
+        if ahocorasick is None:
+            return None
+        ac = ahocorasick.Automaton()
+        for risk_type, pairs in self._risk_patterns_lc.items():
+            for pattern_lc, pattern in pairs:
+                ac.add_word(pattern_lc, (risk_type, pattern))
+        ac.make_automaton()
+        return ac
+
+    @functools.cached_property
+    def _bmh(self):
+        """Jitted Boyer-Moore-Horspool fallback: when pyahocorasick is
+        not installed but numba is, a compiled multi-needle search still
+        beats the interpreted loop. Returns (keys, tables) or None."""
+        if self._ac is not None or _bmh_kernel is None or np is None:
+            return None
+        return self._build_bmh_tables()
+
+    def _build_bmh_tables(self) -> tuple:
+        """Flatten the needles and precompute per-needle BMH skip tables"""
+        keys = []
+        needles = []
+        for risk_type, pairs in self._risk_patterns_lc.items():
+            for pattern_lc, pattern in pairs:
+                keys.append((risk_type, pattern))
+                needles.append(pattern_lc.encode())
+
+        pat_flat = np.frombuffer(b"".join(needles), dtype=np.uint8)
+        pat_off = np.zeros(len(needles) + 1, dtype=np.int64)
+        np.cumsum([len(nd) for nd in needles], out=pat_off[1:])
+
+        skip = np.empty((len(needles), 256), dtype=np.int64)
+        for p, needle in enumerate(needles):
+            m = len(needle)
+            skip[p, :] = m
+            for k in range(m - 1):
+                skip[p, needle[k]] = m - 1 - k
+
+        return keys, (pat_flat, pat_off, skip)
+
     async def analyze_behavioral_risk(self, trajectory_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze trajectory for behavioral risks"""
         
-        # Extract conversation text
-        conversation = trajectory_data.get("conversation", [])
-        full_text = " ".join([msg.get("content", "").lower() for msg in conversation])
-        
-        # Detect risk patterns
+        # Extract conversation text and hash it in the same pass; the
+        # digest doubles as the memo key, so the joined text is never
+        # re-encoded just to key the cache
+        if isinstance(trajectory_data, Trajectory):
+            full_text, key = _fold_contents(trajectory_data.contents)
+        else:
+            full_text, key = _fold_conversation(trajectory_data.get("conversation", []))
+
+        # Detect risk patterns, memoized on the text digest
+        cached = self._scan_cache.get(key)
+        if cached is not None:
+            self._scan_cache.move_to_end(key)
+            detected_risks, risk_scores, max_confidence = cached
+        else:
+            detected_risks, risk_scores, max_confidence = self._scan(full_text)
+            self._scan_cache[key] = (detected_risks, risk_scores, max_confidence)
+            if len(self._scan_cache) > self._SCAN_CACHE_MAX:
+                self._scan_cache.popitem(last=False)
+
+        return self._build_report(detected_risks, max_confidence)
+
+    def _build_report(self, detected_risks: list, max_confidence: float) -> Dict[str, Any]:
+        """Assemble the analysis result dict for one trajectory"""
+        # Common case: nothing detected; stamp a copy of the template
+        # instead of re-interpolating the whole dict
+        if not detected_risks:
+            report = _NO_RISK_TEMPLATE.copy()
+            report["analysis_timestamp"] = _fast_iso_now()
+            return report
+
+        # Generate reasoning
+        risk_types = [r["type"].replace("_", " ").title() for r in detected_risks]
+        reasoning = f"Detected {len(detected_risks)} risk indicators: {', '.join(risk_types)}. "
+        reasoning += f"Confidence level: {max_confidence:.2f}. "
+        reasoning += "The conversation shows patterns consistent with behavioral anomalies."
+
+        return {
+            "behavioral_risk_detected": True,
+            "confidence_score": max_confidence,
+            "detected_risks": detected_risks,
+            "risk_reasoning": reasoning,
+            "analysis_timestamp": _fast_iso_now(),
+            "processing_mode": "pattern_analysis"
+        }
+
+    async def analyze_behavioral_risk_batch(self, trajectories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Analyze many trajectories with one vectorized scan per pattern.
+
+        With numpy available, each needle is checked against every
+        trajectory at once via np.char.find, so the T x P substring work
+        runs inside one C call per pattern instead of a Python loop per
+        trajectory. Results are identical to per-trajectory analysis.
+        """
+        texts = [
+            " ".join(msg.get("content", "")
+                     for msg in t.get("conversation", [])).lower()
+            for t in trajectories
+        ]
+
+        if np is None or not texts:
+            results = []
+            for text in texts:
+                detected_risks, _, max_confidence = self._scan(text)
+                results.append(self._build_report(detected_risks, max_confidence))
+            return results
+
+        arr = np.array(texts)
+        # Boolean hit matrix per (risk_type, pattern) across all texts
+        matches_per_text = [dict() for _ in texts]
+        for risk_type, pairs in self._risk_patterns_lc.items():
+            for pattern_lc, pattern in pairs:
+                mask = np.char.find(arr, pattern_lc) >= 0
+                if not mask.any():
+                    continue
+                for i in np.flatnonzero(mask):
+                    matches_per_text[i].setdefault(risk_type, []).append(pattern)
+
+        results = []
+        for matches_by_type in matches_per_text:
+            detected_risks, _, max_confidence = self._score(matches_by_type)
+            results.append(self._build_report(detected_risks, max_confidence))
+        return results
+
+    def _scan(self, full_text: str) -> tuple:
+        """Run the pattern scan over lowercased text.
+
+        Pure over its input, so results are safe to memoize by text digest.
+        """
+        # No first character of any needle present means nothing can
+        # match; bail before touching the pattern structures
+        if self._probe_re.search(full_text) is None:
+            return self._score({})
+
+        if self._ac is not None:
+            # Single automaton pass; bucket the hits back onto categories,
+            # keeping the original pattern order for evidence reporting
+            found = {key for _, key in self._ac.iter(full_text)}
+            matches_by_type = {
+                risk_type: [p for p in patterns if (risk_type, p) in found]
+                for risk_type, patterns in self.risk_patterns.items()
+            }
+        elif self._bmh is not None:
+            # Compiled multi-needle BMH pass; needles are ASCII, so the
+            # byte-level search is exact over the UTF-8 encoded text
+            keys, tables = self._bmh
+            hay = np.frombuffer(full_text.encode(), dtype=np.uint8)
+            hits = _bmh_kernel(hay, *tables)
+            found = {keys[p] for p in range(len(keys)) if hits[p]}
+            matches_by_type = {
+                risk_type: [p for p in patterns if (risk_type, p) in found]
+                for risk_type, patterns in self.risk_patterns.items()
+            }
+        else:
+            matches_by_type = {}
+            for risk_type, pairs in self._risk_patterns_lc.items():
+                found_lc = set(self._risk_re[risk_type].findall(full_text))
+                matches_by_type[risk_type] = [p for p_lc, p in pairs if p_lc in found_lc]
+
+        return self._score(matches_by_type)
+
+    def _score(self, matches_by_type: Dict[str, list]) -> tuple:
+        """Turn per-category pattern matches into scores and evidence"""
         detected_risks = []
         risk_scores = {}
-        
-        for risk_type, patterns in self.risk_patterns.items():
-            pattern_matches = []
-            for pattern in patterns:
-                if pattern.lower() in full_text:
-                    pattern_matches.append(pattern)
-            
+        max_confidence = 0.0
+
+        for risk_type, pattern_matches in matches_by_type.items():
             if pattern_matches:
                 risk_score = min(1.0, len(pattern_matches) * 0.3)
                 risk_scores[risk_type] = risk_score
+                if risk_score > max_confidence:
+                    max_confidence = risk_score
                 detected_risks.append({
                     "type": risk_type,
                     "confidence": risk_score,
                     "evidence": pattern_matches[:3]  # Top 3 matches
                 })
-        
-        # Calculate overall risk
-        overall_risk = len(detected_risks) > 0
-        max_confidence = max(risk_scores.values()) if risk_scores else 0.0
-        
-        # Generate reasoning
-        if detected_risks:
-            risk_types = [r["type"].replace("_", " ").title() for r in detected_risks]
-            reasoning = f"Detected {len(detected_risks)} risk indicators: {', '.join(risk_types)}. "
-            reasoning += f"Confidence level: {max_confidence:.2f}. "
-            reasoning += "The conversation shows patterns consistent with behavioral anomalies."
-        else:
-            reasoning = "No significant behavioral risk patterns detected. The conversation appears to follow expected interaction patterns."
-        
-        return {
-            "behavioral_risk_detected": overall_risk,
-            "confidence_score": max_confidence,
-            "detected_risks": detected_risks,
-            "risk_reasoning": reasoning,
-            "analysis_timestamp": datetime.now().isoformat(),
-            "processing_mode": "pattern_analysis"
-        }
+
+        return detected_risks, risk_scores, max_confidence
 
     def simulate_performance_optimization(self) -> Dict[str, Any]:
         """Simulate the performance optimizations"""
@@ -220,13 +533,17 @@ async def main():
     print("=" * 35)
     
     results = []
-    
-    for scenario_key, scenario in test_scenarios.items():
+
+    # The analyses are independent, so launch them all at once; reporting
+    # below keeps scenario order via zip
+    analyses = await asyncio.gather(
+        *(demo.analyze_behavioral_risk(scenario['trajectory'])
+          for scenario in test_scenarios.values())
+    )
+
+    for scenario, result in zip(test_scenarios.values(), analyses):
         print(f"\n🧪 Testing: {scenario['name']}")
-        
-        # Analyze the trajectory
-        result = await demo.analyze_behavioral_risk(scenario['trajectory'])
-        
+
         risk_detected = result['behavioral_risk_detected']
         expected_risk = scenario['expected_risk']
         correct_prediction = risk_detected == expected_risk
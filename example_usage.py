@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+📖 AnomalyAgent - API Usage Examples
+====================================
+
+Minimal examples showing how to drive the AnomalyAgent API:
+a step-by-step session workflow and a one-shot trajectory assessment.
+
+Usage: python3 example_usage.py
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+import time
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter, Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps_bytes(obj) -> bytes:
+    """Serialize to JSON bytes with orjson when available"""
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode()
+
+
+def _loads(data: bytes):
+    """Parse JSON bytes with orjson when available, skipping the str decode"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+# API Configuration
+API_BASE = "http://localhost:8081"
+
+# One pooled session shared by every example call. Keep-alive reuses the
+# TCP connection across the step loop instead of paying a fresh handshake
+# per request, and transient connection errors are retried at the adapter.
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2),
+)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+_SESSION.headers.update({
+    "Content-Type": "application/json",
+    "Connection": "keep-alive",
+})
+
+# Content type for pre-serialized bodies sent through the httpx client
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Memoized step assessments keyed by (session_id, step_number, content
+# hash). Replaying the same step skips the /assess round-trip entirely.
+# In-process only; entries expire after an hour.
+_ASSESS_CACHE: dict = {}
+ASSESS_CACHE_TTL_S = 3600.0
+
+
+def _step_cache_key(session_id: str, step: dict) -> tuple:
+    """Cache key for one step assessment within a session"""
+    if orjson is not None:
+        payload = orjson.dumps(step, option=orjson.OPT_SORT_KEYS)
+    else:
+        payload = json.dumps(step, sort_keys=True).encode()
+    content_hash = hashlib.blake2s(payload, digest_size=12).hexdigest()
+    return (session_id, step["step_number"], content_hash)
+
+
+async def _assess_step(client: httpx.AsyncClient, session_id: str, step: dict,
+                       use_cache: bool = True):
+    """POST one step for assessment, memoizing the parsed response.
+
+    Returns the assessment dict, or None if the request failed.
+    """
+    key = _step_cache_key(session_id, step)
+    if use_cache:
+        cached = _ASSESS_CACHE.get(key)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+
+    resp = await client.post(
+        f"/sessions/{session_id}/assess",
+        content=_dumps_bytes({"step_data": step}),
+        headers=_JSON_HEADERS,
+    )
+    if resp.status_code != 200:
+        return None
+
+    assessment = _loads(resp.content)
+    if use_cache:
+        _ASSESS_CACHE[key] = (time.monotonic() + ASSESS_CACHE_TTL_S, assessment)
+    return assessment
+
+# Example trajectory steps for the session workflow
+EXAMPLE_STEPS = (
+    {
+        "step_number": 1,
+        "step_type": "planning",
+        "content": "User Request: 'Help me summarize this quarterly sales report.'"
+    },
+    {
+        "step_number": 2,
+        "step_type": "action",
+        "content": "Agent: 'I'll read the report and extract the key figures for you.'"
+    },
+    {
+        "step_number": 3,
+        "step_type": "action",
+        "content": "Agent: 'Here is a concise summary of revenue, growth and regional trends.'"
+    },
+)
+
+
+def check_api_health() -> bool:
+    """Verify the API server is reachable before running examples"""
+    try:
+        response = _SESSION.get(f"{API_BASE}/health", timeout=5)
+        if response.status_code == 200:
+            status = _loads(response.content).get("status", "healthy")
+            print(f"✅ API server is {status}")
+            return True
+    except Exception:
+        pass
+
+    print(f"❌ API server not running at {API_BASE}")
+    print("💡 Start the server first: python3 run.py")
+    return False
+
+
+async def example_session_workflow(parallel: bool = False, use_cache: bool = True):
+    """Create a session, assess each step, read the state and clean up.
+
+    Sequential mode keeps the step-by-step narrative. With ``parallel``
+    the independent steps are submitted concurrently and the workflow
+    stops waiting as soon as one assessment reports a risk.
+    """
+    mode = "parallel" if parallel else "sequential"
+    print(f"\n📋 EXAMPLE: Step-by-step session workflow ({mode})")
+    print("=" * 45)
+
+    async with httpx.AsyncClient(base_url=API_BASE, timeout=120) as client:
+        create_resp = await client.post("/sessions", json={})
+        if create_resp.status_code != 200:
+            print(f"❌ Session creation failed: {create_resp.status_code}")
+            return
+
+        session_id = _loads(create_resp.content)["session_id"]
+        print(f"✅ Created session: {session_id[:8]}...")
+
+        if parallel:
+            await _submit_steps_parallel(client, session_id, use_cache=use_cache)
+        else:
+            for step in EXAMPLE_STEPS:
+                assessment = await _assess_step(client, session_id, step,
+                                                use_cache=use_cache)
+                if assessment is not None:
+                    print(f"   Step {step['step_number']}: "
+                          f"risk_detected={assessment.get('risk_detected', False)}")
+                else:
+                    print(f"   Step {step['step_number']}: failed")
+
+        state_resp = await client.get(f"/sessions/{session_id}")
+        if state_resp.status_code == 200:
+            state = _loads(state_resp.content)
+            print(f"📊 Final risk score: {state.get('risk_score', 'Unknown')}")
+            print(f"📊 Steps analyzed: {len(state.get('trajectory', []))}")
+
+        await client.delete(f"/sessions/{session_id}")
+        print("🧹 Session cleaned up")
+
+
+async def _submit_steps_parallel(client: httpx.AsyncClient, session_id: str,
+                                 use_cache: bool = True):
+    """Submit all steps concurrently, stopping at the first detected risk.
+
+    The assessments are independent, so the wall time collapses from N
+    sequential round trips to roughly one; ``as_completed`` lets us cancel
+    the remaining requests once a risk is found.
+    """
+    async def assess(step):
+        assessment = await _assess_step(client, session_id, step,
+                                        use_cache=use_cache)
+        return step, assessment
+
+    tasks = [asyncio.ensure_future(assess(step)) for step in EXAMPLE_STEPS]
+    try:
+        for future in asyncio.as_completed(tasks):
+            step, assessment = await future
+            if assessment is None:
+                print(f"   Step {step['step_number']}: failed")
+                continue
+            risk_detected = assessment.get('risk_detected', False)
+            print(f"   Step {step['step_number']}: risk_detected={risk_detected}")
+            if risk_detected:
+                print("   ⚠️ Risk detected - skipping remaining steps")
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def example_single_assessment():
+    """Submit a complete trajectory to /analyze in one request"""
+    print("\n🔍 EXAMPLE: One-shot trajectory assessment")
+    print("=" * 45)
+
+    trajectory_data = {
+        "conversation": [
+            {"role": "user", "content": "Can you help me draft a project status update?"},
+            {"role": "assistant", "content": "Of course - I'll draft the update based on your notes."}
+        ],
+        "metadata": {"session_id": "example_001"}
+    }
+
+    response = _SESSION.post(
+        f"{API_BASE}/analyze",
+        data=_dumps_bytes({
+            "trajectory_data": _dumps_bytes(trajectory_data).decode(),
+            "trajectory_format": "json",
+        }),
+        timeout=120,
+    )
+
+    if response.status_code == 200:
+        result = _loads(response.content)
+        print(f"📊 Risk detected: {result.get('behavioral_risk_detected', False)}")
+        print(f"📊 Confidence: {result.get('confidence_score', 'Unknown')}")
+    else:
+        print(f"❌ Analysis failed: {response.status_code}")
+
+
+def main():
+    """Run all usage examples"""
+    parser = argparse.ArgumentParser(description="AnomalyAgent API usage examples")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Submit session steps concurrently")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Disable the client-side assessment cache")
+    args = parser.parse_args()
+
+    print("📖 ANOMALY AGENT - API USAGE EXAMPLES")
+    print("=" * 45)
+
+    if not check_api_health():
+        sys.exit(1)
+
+    asyncio.run(example_session_workflow(parallel=args.parallel,
+                                         use_cache=not args.no_cache))
+    example_single_assessment()
+
+    print("\n🏁 Examples complete")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ from .models import (
     RuntimeSession, AgentStep, RiskAssessment,
     CreateSessionRequest, CreateSessionResponse,
     AssessStepRequest, AssessStepResponse,
+    AssessStepBatchRequest, AssessStepBatchResponse,
     SessionStateResponse, AgentStepRequest
 )
 from .session_manager import SessionManager
@@ -12,5 +13,6 @@ __all__ = [
     "RuntimeSession", "AgentStep", "RiskAssessment", "SessionManager",
     "CreateSessionRequest", "CreateSessionResponse",
     "AssessStepRequest", "AssessStepResponse",
+    "AssessStepBatchRequest", "AssessStepBatchResponse",
     "SessionStateResponse", "AgentStepRequest"
 ]
\ No newline at end of file
@@ -212,6 +212,16 @@ class AssessStepResponse(BaseModel):
     evidence: List[str] = Field(default_factory=list)
 
 
+class AssessStepBatchRequest(BaseModel):
+    """Request model for batched step assessment."""
+    steps: List[AgentStepRequest]
+
+
+class AssessStepBatchResponse(BaseModel):
+    """Response model for batched step assessment."""
+    results: List[AssessStepResponse]
+
+
 class SessionStateResponse(BaseModel):
     """Response model for session state."""
     session_id: str
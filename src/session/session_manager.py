@@ -119,6 +119,32 @@ class SessionManager:
             except Exception as e:
                 raise InvalidStepDataError(f"Invalid step data: {str(e)}")
     
+    def apply_step(self, session_id: str, step_data: AgentStepRequest) -> List[AgentStep]:
+        """
+        Add a step and return the updated context window in one locked
+        transaction.
+
+        Callers that previously paired add_step() with get_context() can use
+        this to enter the critical section once; risk assessment should then
+        run on the returned snapshot outside the lock.
+
+        Args:
+            session_id: The session identifier
+            step_data: The step data to add
+
+        Returns:
+            List[AgentStep]: The context window after the step is added
+
+        Raises:
+            SessionNotFoundError: If session doesn't exist
+            SessionExpiredError: If session has expired
+            InvalidStepDataError: If step data is invalid
+        """
+        with self._lock:
+            self.add_step(session_id, step_data)
+            session = self._get_session(session_id)
+            return session.get_context_window()
+
     def add_risk_assessment(self, session_id: str, assessment: RiskAssessment) -> None:
         """
         Add a risk assessment to a session.